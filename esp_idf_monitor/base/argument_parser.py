@@ -8,38 +8,72 @@ import sys
 from .constants import (DEFAULT_PRINT_FILTER, DEFAULT_TARGET_RESET,
                         DEFAULT_TOOLCHAIN_PREFIX, PANIC_DECODE_BACKTRACE,
                         PANIC_DECODE_DISABLE)
-from .coredump import COREDUMP_DECODE_DISABLE, COREDUMP_DECODE_INFO
+
+
+class _EnvDefault:
+    """Argparse default looked up in the environment at parse time.
+
+    Building the parser doesn't read any environment variables; the lookup
+    happens only when no value was given on the command line.
+    """
+
+    def __init__(self, *env_names, default=None, cast=None):
+        self.env_names = env_names
+        self.default = default
+        self.cast = cast
+
+    def resolve(self):
+        for name in self.env_names:
+            value = os.environ.get(name)
+            if value is not None:
+                return self.cast(value) if self.cast else value
+        return self.default
+
+
+class _ArgumentParser(argparse.ArgumentParser):
+    """ArgumentParser resolving _EnvDefault placeholders left in the namespace"""
+
+    def parse_args(self, args=None, namespace=None):  # type: ignore
+        namespace = super().parse_args(args, namespace)
+        for name, value in vars(namespace).items():
+            if isinstance(value, _EnvDefault):
+                setattr(namespace, name, value.resolve())
+        return namespace
 
 
 def get_parser():  # type: () -> argparse.ArgumentParser
-    parser = argparse.ArgumentParser('idf_monitor - a serial output monitor for esp-idf')
+    # imported here so that just importing this module (e.g. for --help) doesn't
+    # pull in the whole coredump machinery
+    from .coredump import COREDUMP_DECODE_DISABLE, COREDUMP_DECODE_INFO
+
+    parser = _ArgumentParser('idf_monitor - a serial output monitor for esp-idf')
 
     parser.add_argument(
         '--port', '-p',
         help='Serial port device. If not set, a connected port will be used.' +
         (' Defaults to `/dev/ttyUSB0` if connected.' if sys.platform == 'linux' else ''),
-        default=os.environ.get('ESPTOOL_PORT', None)
+        default=_EnvDefault('ESPTOOL_PORT')
     )
 
     parser.add_argument(
         '--no-reset',
         help='Do not reset the chip on monitor startup',
         action='store_true',
-        default=bool(os.getenv('ESP_IDF_MONITOR_NO_RESET', not DEFAULT_TARGET_RESET))
+        default=_EnvDefault('ESP_IDF_MONITOR_NO_RESET', default=not DEFAULT_TARGET_RESET, cast=bool)
     )
 
     parser.add_argument(
         '--disable-address-decoding', '-d',
         help="Don't print lines about decoded addresses from the application ELF file",
         action='store_true',
-        default=os.getenv('ESP_MONITOR_DECODE') == '0'
+        default=_EnvDefault('ESP_MONITOR_DECODE', default=False, cast=lambda v: v == '0')
     )
 
     parser.add_argument(
         '--baud', '-b',
         help='Serial port baud rate',
         type=int,
-        default=os.getenv('IDF_MONITOR_BAUD', os.getenv('MONITORBAUD', 115200)))
+        default=_EnvDefault('IDF_MONITOR_BAUD', 'MONITORBAUD', default=115200, cast=int))
 
     parser.add_argument(
         '--make', '-m',
@@ -75,13 +109,13 @@ def get_parser():  # type: () -> argparse.ArgumentParser
         '--rom-elf-file',
         help='ELF file of target ROM for address decoding. '
         'If not specified, autodetection is attempted based on the IDF_PATH and ESP_ROM_ELF_DIR env vars.',
-        type=lambda f: open(f, 'rb') if os.path.exists(f) else f'{f}',
+        type=str,
     )
 
     parser.add_argument(
         '--print_filter',
         help='Filtering string',
-        default=os.environ.get('ESP_IDF_MONITOR_PRINT_FILTER', DEFAULT_PRINT_FILTER))
+        default=_EnvDefault('ESP_IDF_MONITOR_PRINT_FILTER', default=DEFAULT_PRINT_FILTER))
 
     parser.add_argument(
         '--decode-coredumps',
@@ -100,7 +134,7 @@ def get_parser():  # type: () -> argparse.ArgumentParser
     parser.add_argument(
         '--target',
         help='Target name (used when stack dump decoding is enabled)',
-        default=os.environ.get('IDF_TARGET', 'esp32')
+        default=_EnvDefault('IDF_TARGET', default='esp32')
     )
 
     parser.add_argument(
@@ -112,7 +146,7 @@ def get_parser():  # type: () -> argparse.ArgumentParser
 
     parser.add_argument(
         '--ws',
-        default=os.environ.get('ESP_IDF_MONITOR_WS', None),
+        default=_EnvDefault('ESP_IDF_MONITOR_WS'),
         help='WebSocket URL for communicating with IDE tools for debugging purposes'
     )
 
@@ -124,7 +158,7 @@ def get_parser():  # type: () -> argparse.ArgumentParser
 
     parser.add_argument(
         '--timestamp-format',
-        default=os.environ.get('ESP_IDF_MONITOR_TIMESTAMP_FORMAT', '%Y-%m-%d %H:%M:%S'),
+        default=_EnvDefault('ESP_IDF_MONITOR_TIMESTAMP_FORMAT', default='%Y-%m-%d %H:%M:%S'),
         help='Set a strftime()-compatible timestamp format'
     )
 
@@ -11,6 +11,8 @@
 #
 # for more information see the method "handle_commands" in idf_monitor.py
 
+import bisect
+
 from .constants import MINIMAL_EN_LOW_DELAY
 
 conf = {
@@ -38,6 +40,25 @@ conf = {
 }
 
 
+def _resolve_conf():
+    # type: () -> tuple
+    # Precompute the cumulative merge for every (chip, revision) entry in `conf`
+    # so that lookups don't have to re-merge the dicts on every call.
+    resolved = {}
+    revisions = {}
+    for chip in conf:
+        merged = dict(conf['default'][0])
+        chip_revisions = sorted(conf[chip].keys(), key=int)
+        for rev in chip_revisions:
+            merged.update(conf[chip][rev])
+            resolved[(chip, int(rev))] = dict(merged)
+        revisions[chip] = [int(rev) for rev in chip_revisions]
+    return resolved, revisions
+
+
+_RESOLVED_CONF, _CHIP_REVISIONS = _resolve_conf()
+
+
 def get_chip_config(chip, revision=0):
     # type: (str, int) -> dict
 
@@ -46,15 +67,11 @@ def get_chip_config(chip, revision=0):
     # If chip is set in `conf` but the specific revision R is missing,
     # the values from highest revision lower than R are used.
     # If some fields are missing, they will be taken from next lower revision or from the `default`.
-    default = dict(conf['default'][0])
     rev_number = int(revision)
-    if chip not in conf.keys():
-        return default
-    chip_revisions = sorted(list(conf[chip].keys()), key=int)
-    for rev in chip_revisions:
-        if int(rev) > rev_number:
-            break
-        for key in conf[chip][rev].keys():
-            default[key] = conf[chip][rev][key]
-
-    return default
+    chip_revisions = _CHIP_REVISIONS.get(chip)
+    if not chip_revisions:
+        return dict(conf['default'][0])
+    idx = bisect.bisect_right(chip_revisions, rev_number) - 1
+    if idx < 0:
+        return dict(conf['default'][0])
+    return dict(_RESOLVED_CONF[(chip, chip_revisions[idx])])
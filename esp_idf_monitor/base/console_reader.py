@@ -2,10 +2,10 @@
 # SPDX-License-Identifier: Apache-2.0
 
 
-import os
 import queue  # noqa: F401
 import sys
 import time
+from typing import Optional  # noqa: F401
 
 from serial.tools.miniterm import Console  # noqa: F401
 
@@ -27,6 +27,7 @@ class ConsoleReader(StoppableThread):
         self.cmd_queue = cmd_queue
         self.parser = parser
         self.test_mode = test_mode
+        self._stop_event = None  # type: Optional[int]
         if sys.platform == 'win32':
             # This is a workaround for multi-byte characters causing the console to be killed by OS.
             # Miniterm is setting the code page to UTF-8 which in combination with multibyte Unicode characters
@@ -35,6 +36,9 @@ class ConsoleReader(StoppableThread):
             import ctypes
             ctypes.windll.kernel32.SetConsoleOutputCP(console._saved_ocp)
             ctypes.windll.kernel32.SetConsoleCP(console._saved_icp)
+            # Manual-reset event used to wake the reader thread up immediately on stop()
+            # instead of waiting out the current sleep interval.
+            self._stop_event = ctypes.windll.kernel32.CreateEventW(None, True, False, None)
 
     def run(self):
         # type: () -> None
@@ -48,16 +52,29 @@ class ConsoleReader(StoppableThread):
             new[6][termios.VMIN] = 0  # minimum bytes to read
             new[6][termios.VTIME] = 2  # timer of 0.1 second granularity
             termios.tcsetattr(self.console.fd, termios.TCSANOW, new)
+        elif self._stop_event is not None:
+            # The event is manual-reset, so it stays signalled after a stop();
+            # clear it so a restarted reader (e.g. after a GDB session) blocks
+            # in WaitForMultipleObjects again instead of waking immediately.
+            import ctypes
+            ctypes.windll.kernel32.ResetEvent(self._stop_event)
         try:
             while self.alive:
                 try:
-                    if os.name == 'nt' and not self.test_mode:
+                    if sys.platform == 'win32' and not self.test_mode:
                         # Windows kludge: because the console.cancel() method doesn't
                         # seem to work to unblock getkey() on the Windows implementation.
                         #
                         # So we only call getkey() if we know there's a key waiting for us.
+                        import ctypes
                         import msvcrt
+                        stdin_handle = ctypes.windll.kernel32.GetStdHandle(-10)  # STD_INPUT_HANDLE
+                        handles = (ctypes.c_void_p * 2)(stdin_handle, self._stop_event)
                         while not msvcrt.kbhit() and self.alive:  # type: ignore
+                            # Block on stdin/stop-event instead of polling; the console handle
+                            # is also signalled by non-key events (mouse, resize), so a short
+                            # sleep keeps those from turning this into a busy loop.
+                            ctypes.windll.kernel32.WaitForMultipleObjects(2, handles, False, 1000)
                             time.sleep(0.1)
                         if not self.alive:
                             break
@@ -83,3 +100,9 @@ class ConsoleReader(StoppableThread):
 
         finally:
             self.console.cleanup()
+
+    def _cancel(self):
+        # type: () -> None
+        if sys.platform == 'win32' and self._stop_event is not None:
+            import ctypes
+            ctypes.windll.kernel32.SetEvent(self._stop_event)
@@ -1,7 +1,12 @@
 # SPDX-FileCopyrightText: 2015-2024 Espressif Systems (Shanghai) CO LTD
 # SPDX-License-Identifier: Apache-2.0
 
-from esp_idf_monitor.base.key_config import cfg
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    # declared for type checkers only; resolved lazily through the module
+    # __getattr__ below
+    RECONNECT_DELAY: float
 
 # Control-key characters
 CTRL_C = '\x03'
@@ -33,6 +38,7 @@ DEFAULT_TARGET_RESET = True
 
 # panic handler related messages
 PANIC_START = r'Core \s*\d+ register dump:'
+PANIC_START_PREFIX = b'Core '  # necessary condition for PANIC_START, used as a cheap pre-check
 PANIC_END = b'ELF file SHA256:'
 PANIC_STACK_DUMP = b'Stack memory:'
 
@@ -59,11 +65,11 @@ GDB_EXIT_TIMEOUT = 0.3  # time delay between exit and writing GDB_UART_CONTINUE_
 LAST_LINE_THREAD_INTERVAL = 0.1
 
 MINIMAL_EN_LOW_DELAY = 0.005
-RECONNECT_DELAY = cfg.getint('reconnect_delay', 0.5)  # timeout between reconnect tries
 CHECK_ALIVE_FLAG_TIMEOUT = 0.25  # timeout for checking alive flags (currently used by serial reader)
 
 # closing wait timeout for serial port
 ASYNC_CLOSING_WAIT_NONE = 0xFFFF  # don't wait at all
+ASYNC_LOW_LATENCY = 0x2000  # serial_struct flag asking the kernel for low-latency mode
 
 # Device PIDs
 USB_JTAG_SERIAL_PID = 0x1001
@@ -74,3 +80,14 @@ HIGH = False
 
 # Port names to filter out
 FILTERED_PORTS = ('Bluetooth-Incoming-Port', 'wlan-debug')
+
+
+def __getattr__(name):  # type: (str) -> object
+    # Resolved lazily (PEP 562) because reading the configuration involves
+    # file I/O which shouldn't happen just for importing this module.
+    if name == 'RECONNECT_DELAY':
+        from esp_idf_monitor.base.key_config import cfg
+        value = cfg.getint('reconnect_delay', 0.5)  # timeout between reconnect tries
+        globals()[name] = value
+        return value
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
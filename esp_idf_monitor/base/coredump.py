@@ -4,8 +4,9 @@ import io
 import os
 import queue  # noqa: F401
 import tempfile
+import threading
 from contextlib import contextmanager, redirect_stdout
-from typing import Generator, List, Optional  # noqa: F401
+from typing import IO, Generator, List, Optional  # noqa: F401
 
 from .constants import TAG_KEY
 from .logger import Logger  # noqa: F401
@@ -31,27 +32,50 @@ class CoreDump:
     def __init__(self, decode_coredumps, event_queue, logger, websocket_client, elf_files):
         # type: (str, queue.Queue, Logger, Optional[WebSocketClient], List[str]) -> None
 
-        self._coredump_buffer = b''
+        self._coredump_file = None  # type: Optional[IO[bytes]]
+        self._coredump_size = 0
         self._decode_coredumps = decode_coredumps
         self.event_queue = event_queue
         self._reading_coredump = COREDUMP_IDLE
         self.logger = logger
         self.websocket_client = websocket_client
         self.elf_files = elf_files[0]
+        if self._decode_coredumps == COREDUMP_DECODE_INFO and not self.websocket_client:
+            # Import esp_coredump in the background so the first core dump
+            # doesn't stall on loading the module; monitor startup itself
+            # stays unaffected.
+            threading.Thread(target=self._warm_up_coredump_import, daemon=True).start()
+
+    @staticmethod
+    def _warm_up_coredump_import():  # type: () -> None
+        try:
+            import esp_coredump  # noqa: F401
+        except ImportError:
+            pass  # reported from _process_coredump if a dump actually arrives
+
+    @property
+    def enabled(self) -> bool:
+        """True when lines need to be checked for core dump markers at all"""
+        return self._decode_coredumps != COREDUMP_DECODE_DISABLE
 
     @property
     def in_progress(self) -> bool:
-        return bool(self._coredump_buffer)
+        return self._coredump_file is not None
+
+    def _open_coredump_file(self):  # type: () -> None
+        # On Windows, the temporary file can't be read unless it is closed.
+        # Set delete=False and delete the file manually later.
+        self._coredump_file = tempfile.NamedTemporaryFile(mode='wb', delete=False)
+        self._coredump_size = 0
 
     def _process_coredump(self):  # type: () -> None
         if self._decode_coredumps != COREDUMP_DECODE_INFO:
             raise NotImplementedError('process_coredump: %s not implemented' % self._decode_coredumps)
-        coredump_file = None
-        # On Windows, the temporary file can't be read unless it is closed.
-        # Set delete=False and delete the file manually later.
-        with tempfile.NamedTemporaryFile(mode='wb', delete=False) as coredump_file:
-            coredump_file.write(self._coredump_buffer)
-            coredump_file.flush()
+        coredump_file = self._coredump_file
+        assert coredump_file is not None  # a file is always open while reading
+        self._coredump_file = None
+        self._coredump_size = 0
+        coredump_file.close()
 
         if self.websocket_client:
             self.logger.output_enabled = True
@@ -70,16 +94,20 @@ class CoreDump:
                               f'Module {e.name} is not installed\n\n')
                 self.logger.output_enabled = True
                 self.logger.print(COREDUMP_UART_START + b'\n')
-                self.logger.print(self._coredump_buffer)
+                with open(coredump_file.name, 'rb') as f:
+                    self.logger.print(f.read())
                 # end line will be printed in handle_serial_input
             else:
                 coredump = esp_coredump.CoreDump(core=coredump_file.name, core_format='b64', prog=self.elf_files)
-                f = io.StringIO()
-                with redirect_stdout(f):
+                # capture straight into a bytes buffer so the report doesn't
+                # have to be re-encoded for the logger afterwards
+                buffer = io.BytesIO()
+                wrapper = io.TextIOWrapper(buffer, encoding='utf-8', write_through=True)
+                with redirect_stdout(wrapper):
                     coredump.info_corefile()
-                output = f.getvalue()
+                output = buffer.getvalue()
                 self.logger.output_enabled = True
-                self.logger.print(output.encode('utf-8'))
+                self.logger.print(output)
                 self.logger.output_enabled = False  # Will be re-enabled in check_coredump_trigger_after_print
         if coredump_file is not None:
             try:
@@ -90,6 +118,28 @@ class CoreDump:
     def _check_coredump_trigger_before_print(self, line):  # type: (bytes) -> None
         if self._decode_coredumps == COREDUMP_DECODE_DISABLE:
             return
+        if self._reading_coredump == COREDUMP_READING:
+            # While the dump body (base64 data) is being read, END is the only
+            # marker that can show up; don't scan every line for the others.
+            if COREDUMP_UART_END in line:
+                self._reading_coredump = COREDUMP_DONE
+                note_print('Core dump finished!', prefix='\n')
+                self._process_coredump()
+                return
+            if self._coredump_file is not None:
+                # Stream the dump to the temporary file right away instead of
+                # buffering it whole in memory; only a size counter is kept for
+                # the progress report.
+                kb = 1024
+                buffer_len_kb = self._coredump_size // kb
+                data = line.translate(None, b'\r')
+                self._coredump_file.write(data)
+                self._coredump_file.write(b'\n')
+                self._coredump_size += len(data) + 1
+                new_buffer_len_kb = self._coredump_size // kb
+                if new_buffer_len_kb > buffer_len_kb:
+                    note_print('Received %3d kB...' % new_buffer_len_kb, newline='\r')
+            return
         if COREDUMP_UART_PROMPT in line:
             note_print('Initiating core dump!')
             self.event_queue.put((TAG_KEY, '\n'))
@@ -97,21 +147,18 @@ class CoreDump:
         if COREDUMP_UART_START in line:
             note_print('Core dump started (further output muted)')
             self._reading_coredump = COREDUMP_READING
-            self._coredump_buffer = b''
+            self._open_coredump_file()
             self.logger.output_enabled = False
             return
         if COREDUMP_UART_END in line:
             self._reading_coredump = COREDUMP_DONE
             note_print('Core dump finished!', prefix='\n')
+            if self._coredump_file is None:
+                # END marker without a START; create an empty dump so
+                # processing and cleanup work as usual
+                self._open_coredump_file()
             self._process_coredump()
             return
-        if self._reading_coredump == COREDUMP_READING:
-            kb = 1024
-            buffer_len_kb = len(self._coredump_buffer) // kb
-            self._coredump_buffer += line.replace(b'\r', b'') + b'\n'
-            new_buffer_len_kb = len(self._coredump_buffer) // kb
-            if new_buffer_len_kb > buffer_len_kb:
-                note_print('Received %3d kB...' % new_buffer_len_kb, newline='\r')
 
     def _check_coredump_trigger_after_print(self):  # type: () -> None
         if self._decode_coredumps == COREDUMP_DECODE_DISABLE:
@@ -121,7 +168,6 @@ class CoreDump:
         if not self.logger.output_enabled and self._reading_coredump == COREDUMP_DONE:
             self._reading_coredump = COREDUMP_IDLE
             self.logger.output_enabled = True
-            self._coredump_buffer = b''
 
     @contextmanager
     def check(self, line):  # type: (bytes) -> Generator
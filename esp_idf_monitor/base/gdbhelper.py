@@ -1,13 +1,18 @@
 # SPDX-FileCopyrightText: 2023 Espressif Systems (Shanghai) CO LTD
 # SPDX-License-Identifier: Apache-2.0
 import re
+import signal
 import subprocess
+import threading
 from typing import List, Optional  # noqa: F401
 
 from .logger import Logger  # noqa: F401
 from .output_helpers import error_print, normal_print, note_print
 from .web_socket_client import WebSocketClient  # noqa: F401
 
+# gdb "reason" for a break, e.g. b'$T05#b9'
+GDB_STUB_TRIGGER_REGEX = re.compile(b'\\$(T..)#(..)')
+
 
 class GDBHelper:
     def __init__(self, toolchain_prefix, websocket_client, elf_files, port, baud_rate):
@@ -54,12 +59,22 @@ class GDBHelper:
             except KeyboardInterrupt:
                 pass
             # We ignore Ctrl+C interrupt form external process abd wait response util GDB will be finished.
-            while True:
+            if threading.current_thread() is threading.main_thread():
+                # ignore SIGINT outright instead of fielding a KeyboardInterrupt
+                # (and restarting the wait) for every Ctrl+C aimed at GDB
+                old_handler = signal.signal(signal.SIGINT, signal.SIG_IGN)
                 try:
                     process.wait()
-                    break
-                except KeyboardInterrupt:
-                    pass  # We ignore the Ctrl+C
+                finally:
+                    signal.signal(signal.SIGINT, old_handler)
+            else:
+                # signal handlers can only be changed in the main thread
+                while True:
+                    try:
+                        process.wait()
+                        break
+                    except KeyboardInterrupt:
+                        pass  # We ignore the Ctrl+C
             self.gdb_exit = True
         except OSError as e:
             error_print(f"{' '.join(cmd)}: {e}")
@@ -81,10 +96,10 @@ class GDBHelper:
         # type: (bytes) -> bool
         line = self.gdb_buffer + line
         self.gdb_buffer = b''
-        m = re.search(b'\\$(T..)#(..)', line)  # look for a gdb "reason" for a break
+        m = GDB_STUB_TRIGGER_REGEX.search(line)  # look for a gdb "reason" for a break
         if m is not None:
             try:
-                chsum = sum(ord(bytes([p])) for p in m.group(1)) & 0xFF
+                chsum = sum(m.group(1)) & 0xFF
                 calc_chsum = int(m.group(2), 16)
             except ValueError:  # payload wasn't valid hex digits
                 return False
@@ -1,50 +1,98 @@
 # SPDX-FileCopyrightText: 2023 Espressif Systems (Shanghai) CO LTD
 # SPDX-License-Identifier: Apache-2.0
 
-from typing import Optional
-
-from esp_idf_monitor.config import Config
+from typing import TYPE_CHECKING, List, Optional, Union
 
 from .output_helpers import error_print
 
-cfg, _ = Config().load_configuration()
-cfg = cfg['esp-idf-monitor']
+if TYPE_CHECKING:
+    from configparser import SectionProxy
+
+    # declared for type checkers only; the values are resolved lazily through
+    # the module __getattr__ below
+    cfg: SectionProxy
+    MENU_KEY: str
+    EXIT_KEY: str
+    CHIP_RESET_KEY: str
+    RECOMPILE_UPLOAD_KEY: str
+    RECOMPILE_UPLOAD_APP_KEY: str
+    TOGGLE_OUTPUT_KEY: str
+    TOGGLE_LOG_KEY: str
+    TOGGLE_TIMESTAMPS_KEY: str
+    CHIP_RESET_BOOTLOADER_KEY: str
+    EXIT_MENU_KEY: str
+    SKIP_MENU_KEY: Union[str, bool]
+    COMMAND_KEYS: List[Union[str, bool]]
+
+# mapping of supported keys (A-Z and [,],\,^,_) to their C0 escape codes
+KEY_TO_C0 = {chr(code): chr(code - ord('@')) for code in range(ord('A'), ord('`') + 1)}
 
 
 def key_to_hex(key: Optional[str], default: str) -> str:
     if key is None:
         key = default
-    ascii_code = ord(key.upper())
-    # convert key from string to C0 escape code
-    C0_code = ascii_code - ord('@')
-    if C0_code < 1 or C0_code > 32:
+    try:
+        return KEY_TO_C0[key.upper()]
+    except KeyError:
         error_print(f"Unsupported configuration for key: '{key}', please use just the English alphabet "
                     f"characters (A-Z) and [,],\\,^,_. Using the default option '{default}'.")
-        C0_code = ord(default) - ord('@')
-    return chr(C0_code)
-
-
-MENU_KEY = key_to_hex(cfg.get('menu_key'), 'T')
-EXIT_KEY = key_to_hex(cfg.get('exit_key'), ']')
-CHIP_RESET_KEY = key_to_hex(cfg.get('chip_reset_key'), 'R')
-RECOMPILE_UPLOAD_KEY = key_to_hex(cfg.get('recompile_upload_key'), 'F')
-RECOMPILE_UPLOAD_APP_KEY = key_to_hex(cfg.get('recompile_upload_app_key'), 'A')
-TOGGLE_OUTPUT_KEY = key_to_hex(cfg.get('toggle_output_key'), 'Y')
-TOGGLE_LOG_KEY = key_to_hex(cfg.get('toggle_log_key'), 'L')
-TOGGLE_TIMESTAMPS_KEY = key_to_hex(cfg.get('toggle_timestamp_key'), 'I')
-CHIP_RESET_BOOTLOADER_KEY = key_to_hex(cfg.get('chip_reset_bootloader_key'), 'P')
-EXIT_MENU_KEY = key_to_hex(cfg.get('exit_menu_key'), 'X')
-SKIP_MENU_KEY = cfg.get('skip_menu_key', False)
-
-
-COMMAND_KEYS = [
-    CHIP_RESET_KEY,
-    RECOMPILE_UPLOAD_KEY,
-    RECOMPILE_UPLOAD_APP_KEY,
-    TOGGLE_OUTPUT_KEY,
-    TOGGLE_LOG_KEY,
-    TOGGLE_TIMESTAMPS_KEY,
-    CHIP_RESET_BOOTLOADER_KEY,
-    EXIT_MENU_KEY,
-    SKIP_MENU_KEY
-]
+        return KEY_TO_C0[default]
+
+
+# attributes resolved lazily on first access (PEP 562) so that importing this
+# module doesn't search the filesystem for a configuration file
+_LAZY_ATTRIBUTES = frozenset({
+    'cfg',
+    'MENU_KEY',
+    'EXIT_KEY',
+    'CHIP_RESET_KEY',
+    'RECOMPILE_UPLOAD_KEY',
+    'RECOMPILE_UPLOAD_APP_KEY',
+    'TOGGLE_OUTPUT_KEY',
+    'TOGGLE_LOG_KEY',
+    'TOGGLE_TIMESTAMPS_KEY',
+    'CHIP_RESET_BOOTLOADER_KEY',
+    'EXIT_MENU_KEY',
+    'SKIP_MENU_KEY',
+    'COMMAND_KEYS',
+})
+
+
+def _load_keys():  # type: () -> dict
+    from esp_idf_monitor.config import Config
+    cfg, _ = Config().load_configuration()
+    cfg = cfg['esp-idf-monitor']
+
+    values = {
+        'cfg': cfg,
+        'MENU_KEY': key_to_hex(cfg.get('menu_key'), 'T'),
+        'EXIT_KEY': key_to_hex(cfg.get('exit_key'), ']'),
+        'CHIP_RESET_KEY': key_to_hex(cfg.get('chip_reset_key'), 'R'),
+        'RECOMPILE_UPLOAD_KEY': key_to_hex(cfg.get('recompile_upload_key'), 'F'),
+        'RECOMPILE_UPLOAD_APP_KEY': key_to_hex(cfg.get('recompile_upload_app_key'), 'A'),
+        'TOGGLE_OUTPUT_KEY': key_to_hex(cfg.get('toggle_output_key'), 'Y'),
+        'TOGGLE_LOG_KEY': key_to_hex(cfg.get('toggle_log_key'), 'L'),
+        'TOGGLE_TIMESTAMPS_KEY': key_to_hex(cfg.get('toggle_timestamp_key'), 'I'),
+        'CHIP_RESET_BOOTLOADER_KEY': key_to_hex(cfg.get('chip_reset_bootloader_key'), 'P'),
+        'EXIT_MENU_KEY': key_to_hex(cfg.get('exit_menu_key'), 'X'),
+        'SKIP_MENU_KEY': cfg.get('skip_menu_key', False),
+    }
+    values['COMMAND_KEYS'] = [
+        values['CHIP_RESET_KEY'],
+        values['RECOMPILE_UPLOAD_KEY'],
+        values['RECOMPILE_UPLOAD_APP_KEY'],
+        values['TOGGLE_OUTPUT_KEY'],
+        values['TOGGLE_LOG_KEY'],
+        values['TOGGLE_TIMESTAMPS_KEY'],
+        values['CHIP_RESET_BOOTLOADER_KEY'],
+        values['EXIT_MENU_KEY'],
+        values['SKIP_MENU_KEY'],
+    ]
+    globals().update(values)
+    return values
+
+
+def __getattr__(name):  # type: (str) -> object
+    if name in _LAZY_ATTRIBUTES:
+        return _load_keys()[name]
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
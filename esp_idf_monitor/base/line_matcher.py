@@ -20,13 +20,18 @@ class LineMatcher(object):
     level = {'N': LEVEL_N, 'E': LEVEL_E, 'W': LEVEL_W, 'I': LEVEL_I, 'D': LEVEL_D,
              'V': LEVEL_V, '*': LEVEL_V, '': LEVEL_V}
 
+    # level lookup used by match(); the matcher works on raw bytes so lines
+    # don't have to be decoded just to be filtered
+    level_bytes = {b'N': LEVEL_N, b'E': LEVEL_E, b'W': LEVEL_W, b'I': LEVEL_I,
+                   b'D': LEVEL_D, b'V': LEVEL_V}
+
     def __init__(self, print_filter):
         # type: (str) -> None
         self._dict = dict()
-        self._re = re.compile(r'^(?:\033\[[01];?[0-9]+m?)?([EWIDV]) \([0-9]+\) ([^:]+): ')
+        self._re = re.compile(rb'^(?:\033\[[01];?[0-9]+m?)?([EWIDV]) \([0-9]+\) ([^:]+): ')
         items = print_filter.split()
         if len(items) == 0:
-            self._dict['*'] = self.LEVEL_V  # default is to print everything
+            self._dict[b'*'] = self.LEVEL_V  # default is to print everything
         for f in items:
             s = f.split(r':')
             if len(s) == 1:
@@ -41,20 +46,23 @@ class LineMatcher(object):
                     raise ValueError('Unknown warning level in filter ' + f)
             else:
                 raise ValueError('Missing ":" in filter ' + f)
-            self._dict[s[0]] = lev
+            self._dict[s[0].encode()] = lev
+        # with the default filter every line matches; callers can check this
+        # flag to skip the regex entirely
+        self.matches_all = self._dict == {b'*': self.LEVEL_V}
 
     def match(self, line):
-        # type: (str) -> bool
+        # type: (bytes) -> bool
         try:
             m = self._re.search(line)
             if m:
-                lev = self.level[m.group(1)]
+                lev = self.level_bytes[m.group(1)]
                 if m.group(2) in self._dict:
                     return self._dict[m.group(2)] >= lev
-                return self._dict.get('*', self.LEVEL_N) >= lev
+                return self._dict.get(b'*', self.LEVEL_N) >= lev
         except (KeyError, IndexError):
             # Regular line written with something else than ESP_LOG*
             # or an empty line.
             pass
         # We need something more than "*.N" for printing.
-        return self._dict.get('*', self.LEVEL_N) > self.LEVEL_N
+        return self._dict.get(b'*', self.LEVEL_N) > self.LEVEL_N
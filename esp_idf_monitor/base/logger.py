@@ -3,6 +3,7 @@
 
 import datetime
 import os
+import time
 from typing import AnyStr, BinaryIO, Callable, List, Optional  # noqa: F401
 
 from esp_idf_panic_decoder import PcAddressDecoder
@@ -26,6 +27,14 @@ class Logger:
         self.console = console
         self.timestamps = timestamps
         self.timestamp_format = timestamp_format
+        # Formatted timestamps are cached for the duration of a second; formats
+        # with sub-second fields can't use the cache.
+        self._timestamp_cacheable = '%f' not in timestamp_format
+        self._timestamp_key = None  # type: Optional[int]
+        self._timestamp_value = ''
+        self._prefix_source = None  # type: Optional[str]
+        self._prefix_str = ''
+        self._prefix_bytes = b''
         if enable_address_decoding:
             self.pc_address_decoder = PcAddressDecoder(toolchain_prefix, elf_files, rom_elf_file)
 
@@ -68,7 +77,9 @@ class Logger:
             name = 'log.{}.{}.txt'.format(os.path.splitext(os.path.basename(self.elf_file))[0],
                                           datetime.datetime.now().strftime('%Y%m%d%H%M%S'))
             try:
-                self.log_file = open(name, 'wb+')
+                # larger write buffer so logging high-rate output doesn't hit
+                # the filesystem for every serial chunk
+                self.log_file = open(name, 'wb', buffering=65536)
                 note_print(f'Logging is enabled into file {name}', prefix='\n')
             except Exception as e:  # noqa
                 error_print(f'Log file {name} cannot be created: {e}', prefix='\n')
@@ -84,8 +95,31 @@ class Logger:
             finally:
                 self._log_file = None
 
+    def _format_timestamp(self):  # type: () -> str
+        if not self._timestamp_cacheable:
+            return datetime.datetime.now().strftime(self.timestamp_format)
+        now = int(time.time())
+        if now != self._timestamp_key:
+            self._timestamp_key = now
+            # reuse the epoch second fetched for the cache key instead of
+            # querying the clock a second time through datetime.now()
+            self._timestamp_value = time.strftime(self.timestamp_format, time.localtime(now))
+        return self._timestamp_value
+
     def print(self, string, console_printer=None):
         # type: (AnyStr, Optional[Callable]) -> None
+        if not self.timestamps and not self._log_file:
+            # Fast path for the common setup: no timestamps to insert and no
+            # log file to feed, so the text goes out unmodified.
+            if string:
+                if isinstance(string, type(u'')):
+                    self._start_of_line = string.endswith('\n')
+                else:
+                    self._start_of_line = string.endswith(b'\n')  # type: ignore
+            if self._output_enabled:
+                (console_printer or self.console.write_bytes)(string)
+            return
+
         if console_printer is None:
             console_printer = self.console.write_bytes
 
@@ -95,13 +129,17 @@ class Logger:
             new_line_char = b'\n'  # type: ignore
 
         if string and self.timestamps and (self._output_enabled or self._log_file):
-            t = datetime.datetime.now().strftime(self.timestamp_format)
+            t = self._format_timestamp()
+            if t != self._prefix_source:
+                self._prefix_source = t
+                self._prefix_str = t + ' '
+                self._prefix_bytes = self._prefix_str.encode('ascii')
 
             # "string" is not guaranteed to be a full line. Timestamps should be only at the beginning of lines.
             if isinstance(string, type(u'')):
-                line_prefix = t + ' '
+                line_prefix = self._prefix_str
             else:
-                line_prefix = t.encode('ascii') + b' '  # type: ignore
+                line_prefix = self._prefix_bytes  # type: ignore
 
             # If the output is at the start of a new line, prefix it with the timestamp text.
             if self._start_of_line:
@@ -1,6 +1,9 @@
 # SPDX-FileCopyrightText: 2015-2024 Espressif Systems (Shanghai) CO LTD
 # SPDX-License-Identifier: Apache-2.0
 
+import atexit
+import io
+import os
 import re
 import sys
 from typing import Optional
@@ -18,14 +21,48 @@ ANSI_YELLOW_B = ANSI_YELLOW.encode()
 ANSI_NORMAL_B = ANSI_NORMAL.encode()
 
 AUTO_COLOR_REGEX = re.compile(rb'^(I|W|E) \([\d:\. -]+\)')
+# cheap prefix test used to skip the regex on lines that can't match it
+AUTO_COLOR_PREFIXES = (b'I (', b'W (', b'E (')
 
 COMMON_PREFIX = '---'
+COMMON_PREFIX_WARNING = f'{COMMON_PREFIX} Warning:'
+COMMON_PREFIX_ERROR = f'{COMMON_PREFIX} Error:'
+
+
+# stderr as it was at import time; when it is still unreplaced, color_print
+# can write straight to the file descriptor and skip the buffering layers
+_ORIG_STDERR = sys.stderr
+try:
+    _STDERR_FD = sys.stderr.fileno()  # type: Optional[int]
+except (AttributeError, OSError, io.UnsupportedOperation):
+    _STDERR_FD = None
 
 
 def color_print(message: str, color: str, newline: Optional[str] = '\n') -> None:
     """ Print a message to stderr with colored highlighting """
-    sys.stderr.write('%s%s%s%s' % (color, message, ANSI_NORMAL, newline))
-    sys.stderr.flush()
+    payload = '%s%s%s%s' % (color, message, ANSI_NORMAL, newline)
+    if _STDERR_FD is not None and sys.stderr is _ORIG_STDERR:
+        sys.stderr.flush()  # keep ordering with anything already buffered
+        os.write(_STDERR_FD, payload.encode('utf-8', errors='replace'))
+    else:
+        # stderr was replaced (e.g. by the Windows ANSI converter), honour it
+        sys.stderr.write(payload)
+        isatty = getattr(sys.stderr, 'isatty', None)
+        if isatty is None or isatty():
+            # flush per message only when someone is watching; redirected
+            # output stays buffered and is flushed at exit
+            sys.stderr.flush()
+
+
+def flush_stderr():  # type: () -> None
+    """Flush any output buffered on stderr, e.g. after a burst of messages"""
+    try:
+        sys.stderr.flush()
+    except Exception:  # noqa
+        pass
+
+
+atexit.register(flush_stderr)
 
 
 def normal_print(message: str) -> None:
@@ -55,10 +92,10 @@ def note_print(message: str, newline: Optional[str] = '\n', prefix: str = '') ->
 
 
 def warning_print(message: str, newline: Optional[str] = '\n', prefix: str = '') -> None:
-    message = add_common_prefix(message, prefix=f'{COMMON_PREFIX} Warning:')
+    message = add_common_prefix(message, prefix=COMMON_PREFIX_WARNING)
     yellow_print(f'{prefix}{message}', newline=newline)
 
 
 def error_print(message: str, newline: Optional[str] = '\n', prefix: str = '') -> None:
-    message = add_common_prefix(message, prefix=f'{COMMON_PREFIX} Error:')
+    message = add_common_prefix(message, prefix=COMMON_PREFIX_ERROR)
     red_print(f'{prefix}{message}', newline=newline)
@@ -1,16 +1,18 @@
 # SPDX-FileCopyrightText: 2023 Espressif Systems (Shanghai) CO LTD
 # SPDX-License-Identifier: Apache-2.0
 
+import functools
 import os
 import struct
+import sys
 import time
-from typing import Optional
+from typing import Callable, List, Optional, Tuple
 
 import serial
-from serial.tools import list_ports
 
 from esp_idf_monitor.base.chip_specific_config import get_chip_config
-from esp_idf_monitor.base.constants import HIGH, LOW, USB_JTAG_SERIAL_PID
+from esp_idf_monitor.base.constants import (ASYNC_LOW_LATENCY, HIGH, LOW,
+                                            USB_JTAG_SERIAL_PID)
 from esp_idf_monitor.base.output_helpers import error_print, note_print
 from esp_idf_monitor.config import Config
 
@@ -27,20 +29,52 @@ if os.name != 'nt':
     TIOCM_RTS = getattr(termios, 'TIOCM_RTS', 0x004)
 
 
-class Reset:
+@functools.lru_cache(maxsize=1)
+def _comports() -> list:
+    """Enumerate serial ports once per process
+
+    Scanning the system for ports is I/O heavy and Reset instances are
+    created several times with the same result; the import is deferred as
+    well since list_ports pulls in platform-specific backends.
+    """
+    from serial.tools import list_ports
+    return list(list_ports.comports())
 
-    format_dict = {
-        'D': 'self._setDTR({})',
-        'R': 'self._setRTS({})',
-        'W': 'time.sleep({})',
-        'U': 'self._setDTRandRTS({})',
-    }
+
+class Reset:
 
     def __init__(self, serial_instance: serial.Serial, chip: str) -> None:
         self.serial_instance = serial_instance
         self.chip_config = get_chip_config(chip)
         self.port_pid = self._get_port_pid()
         self._load_config()
+        self._try_enable_low_latency()
+
+    def _try_enable_low_latency(self) -> None:
+        """Set the ASYNC_LOW_LATENCY flag on the serial fd (Linux only)
+
+        Asks the kernel to pass received bytes up immediately instead of
+        batching them; best effort and silently skipped where unsupported
+        or when the port isn't open yet.
+        """
+        if sys.platform != 'linux':
+            return
+        if not hasattr(self.serial_instance, 'fd') or not getattr(self.serial_instance, 'is_open', False):
+            return
+        # `serial_struct` format based on linux kernel source:
+        # https://github.com/torvalds/linux/blob/25aa0bebba72b318e71fe205bfd1236550cc9534/include/uapi/linux/serial.h#L19
+        struct_format = 'iiIiiiiiHcciHHPHIL'
+        try:
+            buf = bytes(struct.calcsize(struct_format))
+            buf = fcntl.ioctl(self.serial_instance.fd, termios.TIOCGSERIAL, buf)
+            fields = list(struct.unpack(struct_format, buf))
+            # `flags` is the 5th (indexing from 0) variable in `serial_struct`
+            if fields[4] & ASYNC_LOW_LATENCY:
+                return
+            fields[4] |= ASYNC_LOW_LATENCY
+            fcntl.ioctl(self.serial_instance.fd, termios.TIOCSSERIAL, struct.pack(struct_format, *fields))
+        except (OSError, ValueError):
+            pass  # unsupported driver (e.g. USB CDC) or disconnected port
 
     def _load_config(self) -> None:
         """Load configuration for custom reset sequence
@@ -60,13 +94,40 @@ class Reset:
             # get reset sequence from esptool section
             self.custom_seq = custom_config['esptool'].get('custom_reset_sequence')
             self.esptool_config = True
+        self._compiled_seq = self._compile_seq(self.custom_seq)
+
+    def _compile_seq(self, seq_str: Optional[str]) -> List[Tuple[Callable, tuple]]:
+        """Parse custom reset sequence from a config into (callable, args) steps"""
+        if not seq_str:
+            return []
+        fn_dict = {
+            'D': self._setDTR,
+            'R': self._setRTS,
+            'W': time.sleep,
+            'U': self._setDTRandRTS,
+        }  # type: dict
+        compiled = []
+        try:
+            for cmd in seq_str.split('|'):
+                fn = fn_dict[cmd[0]]
+                if cmd[0] == 'W':
+                    args = (float(cmd[1:]),)  # type: tuple
+                elif cmd[0] == 'U':
+                    args = tuple(int(arg) for arg in cmd[1:].split(','))
+                else:
+                    args = (int(cmd[1:]),)
+                compiled.append((fn, args))
+        except Exception as e:
+            error_print(f'Invalid "custom_reset_sequence" option format: {e}')
+            return []
+        return compiled
 
     def _get_port_pid(self) -> Optional[int]:
         """Get port PID to differentiate between JTAG and UART reset sequences"""
         if not hasattr(self.serial_instance, 'port'):
             # Linux target serial does not have a port and thus does not support resseting
             return None
-        for port in list_ports.comports():
+        for port in _comports():
             if port.device == self.serial_instance.port:
                 return port.pid  # type: ignore
         return None  # port not found in connected ports
@@ -78,7 +139,10 @@ class Reset:
     def _setRTS(self, value: bool) -> None:
         """Wrapper for setting RTS with workaround for Windows"""
         self.serial_instance.setRTS(value)
-        self.serial_instance.setDTR(self.serial_instance.dtr)  # usbser.sys workaround
+        if os.name == 'nt':
+            # usbser.sys workaround: an RTS change only propagates once DTR is
+            # rewritten; on other platforms it would just cost two extra ioctls
+            self.serial_instance.setDTR(self.serial_instance.dtr)
 
     def _setDTRandRTS(self, dtr: bool = HIGH, rts: bool = HIGH) -> None:
         """Set DTR and RTS at the same time, this is only supported on linux with custom reset sequence"""
@@ -98,16 +162,6 @@ class Reset:
             status &= ~TIOCM_RTS
         fcntl.ioctl(self.serial_instance.fileno(), TIOCMSET, struct.pack('I', status))
 
-    def _parse_string_to_seq(self, seq_str: str) -> str:
-        """Parse custom reset sequence from a config"""
-        try:
-            cmds = seq_str.split('|')
-            fn_calls_list = [self.format_dict[cmd[0]].format(cmd[1:]) for cmd in cmds]
-        except Exception as e:
-            error_print(f'Invalid "custom_reset_sequence" option format: {e}')
-            return ''
-        return '\n'.join(fn_calls_list)
-
     def hard(self) -> None:
         """Hard reset chip"""
         self._setRTS(LOW)  # EN=LOW, chip in reset
@@ -120,7 +174,8 @@ class Reset:
             # use custom reset sequence set in config file
             source = 'from esptool ' if self.esptool_config else ''
             note_print(f'Using custom reset sequence {source}config file: {self.config_path}')
-            exec(self._parse_string_to_seq(self.custom_seq))
+            for fn, args in self._compiled_seq:
+                fn(*args)
         elif self.port_pid == USB_JTAG_SERIAL_PID:
             # use reset sequence for JTAG
             self._setRTS(HIGH)
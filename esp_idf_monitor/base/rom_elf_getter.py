@@ -1,6 +1,7 @@
 # SPDX-FileCopyrightText: 2023-2025 Espressif Systems (Shanghai) CO LTD
 # SPDX-License-Identifier: Apache-2.0
 
+import functools
 import json
 import os
 from typing import Optional  # noqa: F401
@@ -11,18 +12,26 @@ ESP_ROM_ELF_DIR = os.getenv('ESP_ROM_ELF_DIR', '')
 ROMS_JSON = [os.path.join(IDF_PATH, 'components', 'esp_rom', 'roms.json'), os.path.join(IDF_PATH, 'tools', 'idf_py_actions', 'roms.json')]
 
 
+@functools.lru_cache(maxsize=None)
+def _load_roms(roms_json_path):  # type: (str) -> Optional[dict]
+    """Parse the given roms.json once; None when the file doesn't exist"""
+    try:
+        with open(roms_json_path, 'r') as file:
+            return dict(json.load(file))
+    except FileNotFoundError:
+        return None
+
+
 def get_rom_elf_path(target, chip_rev):  # type: (str, int) -> Optional[str]
     if not IDF_PATH or not ESP_ROM_ELF_DIR:  # The utility is running out of IDF
         return None
     target_roms = None
 
     for roms_json_path in ROMS_JSON:
-        try:
-            with open(roms_json_path, 'r') as file:
-                target_roms = json.load(file).get(target, [])
+        roms = _load_roms(roms_json_path)
+        if roms is not None:
+            target_roms = roms.get(target, [])
             break
-        except FileNotFoundError:
-            continue
 
     if not target_roms:  # No suitable ROMs found
         return None
@@ -2,11 +2,12 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import hashlib
+import mmap
 import os
 import queue  # noqa: F401
 import re
 import subprocess
-from typing import Callable, List, Optional  # noqa: F401
+from typing import Callable, Dict, List, Optional, Tuple  # noqa: F401
 
 import serial  # noqa: F401
 from esp_idf_panic_decoder import PanicOutputDecoder
@@ -20,7 +21,7 @@ from .constants import (CMD_APP_FLASH, CMD_ENTER_BOOT, CMD_MAKE,
                         CMD_TOGGLE_LOGGING, CMD_TOGGLE_TIMESTAMPS,
                         CONSOLE_STATUS_QUERY, PANIC_DECODE_DISABLE, PANIC_END,
                         PANIC_IDLE, PANIC_READING, PANIC_READING_STACK,
-                        PANIC_STACK_DUMP, PANIC_START)
+                        PANIC_STACK_DUMP, PANIC_START, PANIC_START_PREFIX)
 from .coredump import CoreDump  # noqa: F401
 from .exceptions import SerialStopException
 from .gdbhelper import GDBHelper  # noqa: F401
@@ -28,15 +29,40 @@ from .key_config import CHIP_RESET_KEY, EXIT_KEY, MENU_KEY
 from .line_matcher import LineMatcher  # noqa: F401
 from .logger import Logger  # noqa: F401
 from .output_helpers import (ANSI_GREEN_B, ANSI_NORMAL_B, ANSI_RED_B,
-                             ANSI_YELLOW_B, AUTO_COLOR_REGEX, note_print,
+                             ANSI_YELLOW_B, AUTO_COLOR_PREFIXES,
+                             AUTO_COLOR_REGEX, flush_stderr, note_print,
                              warning_print)
 from .reset import Reset
 from .serial_reader import Reader  # noqa: F401
 
+# compiled on bytes so incoming lines don't have to be decoded first
+PANIC_START_REGEX = re.compile(PANIC_START.encode('ascii'))
+# encoded once; the exit key is compared against every received line
+EXIT_KEY_B = EXIT_KEY.encode('latin-1')
+ELF_SHA256_REGEX = re.compile(r'ELF file SHA256:\s+(?P<sha256_flashed>[a-z0-9]+)')
+
+# log level captured by AUTO_COLOR_REGEX -> color escape code
+LEVEL_COLORS = {
+    b'I': ANSI_GREEN_B,
+    b'W': ANSI_YELLOW_B,
+    b'E': ANSI_RED_B,
+}
+
 
 def get_sha256(filename, block_size=65536):  # type: (str, int) -> str
-    sha256 = hashlib.sha256()
     with open(filename, 'rb') as f:
+        try:
+            # hash the mapped file directly, avoiding the read()-buffer copies
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return hashlib.sha256(mm).hexdigest()
+        except (ValueError, OSError):
+            # empty file or a filesystem without mmap support
+            pass
+        # Python 3.11+; hashes in C without the Python-level read loop
+        file_digest = getattr(hashlib, 'file_digest', None)
+        if file_digest is not None:
+            return str(file_digest(f, hashlib.sha256).hexdigest())
+        sha256 = hashlib.sha256()
         for block in iter(lambda: f.read(block_size), b''):
             sha256.update(block)
     return sha256.hexdigest()
@@ -72,7 +98,7 @@ class SerialHandler:
         self.logger = logger
         self._decode_panic = decode_panic
         self._reading_panic = reading_panic
-        self._panic_buffer = panic_buffer
+        self._panic_buffer = bytearray(panic_buffer)
         self.target = target
         self._force_line_print = force_line_print
         self.start_cmd_sent = start_cmd_sent
@@ -81,6 +107,11 @@ class SerialHandler:
         self.elf_files = elf_files
         self.decode_error_cnt = 0
         self._trailing_color = False
+        # digests keyed by path, guarded by (mtime_ns, size) of the hashed file
+        self._sha256_cache = {}  # type: Dict[str, Tuple[Tuple[int, int], str]]
+        # set to True once all ELF files were seen on disk; None re-checks on
+        # the next SHA256 log line (a negative result is never cached)
+        self._elf_files_exist = None  # type: Optional[bool]
         self.reset = Reset(serial_instance, target)
         self.panic_handler = PanicOutputDecoder(toolchain_prefix, elf_files, target)
         self.disable_auto_color = disable_auto_color
@@ -105,38 +136,56 @@ class SerialHandler:
             self.logger.print(line)
             return
 
-        # Line ending can be only at the end because of the split in splitdata
-        line_stripped = line.rstrip(b'\r\n')
-        new_line = line[len(line_stripped):]
-
-        match = AUTO_COLOR_REGEX.match(line_stripped)
+        # The regex is anchored at the start, so it can run on the raw line;
+        # stripping the line ending is deferred until it is actually needed.
+        match = AUTO_COLOR_REGEX.match(line) if line.startswith(AUTO_COLOR_PREFIXES) else None
         if not match:
-            if self._trailing_color and new_line:
-                # Color set in some previous call and now we have a line
-                # ending, so reset the color
-                self.logger.print(line_stripped + ANSI_NORMAL_B + new_line)
-                self._trailing_color = False
-            else:
-                # No color and no need for reset, just print the line
-                self.logger.print(line)
+            if self._trailing_color:
+                # Line ending can be only at the end because of the split in splitdata
+                line_stripped = line.rstrip(b'\r\n')
+                new_line = line[len(line_stripped):]
+                if new_line:
+                    # Color set in some previous call and now we have a line
+                    # ending, so reset the color
+                    self.logger.print(b''.join((line_stripped, ANSI_NORMAL_B, new_line)))
+                    self._trailing_color = False
+                    return
+            # No color and no need for reset, just print the line
+            self.logger.print(line)
             return
 
-        if match.group(1) == b'I':
-            color = ANSI_GREEN_B
-        elif match.group(1) == b'W':
-            color = ANSI_YELLOW_B
-        elif match.group(1) == b'E':
-            color = ANSI_RED_B
+        line_stripped = line.rstrip(b'\r\n')
+        new_line = line[len(line_stripped):]
+
+        color = LEVEL_COLORS[match.group(1)]
 
         if new_line:
             # Full line, print with color and reset
-            self.logger.print(color + line_stripped + ANSI_NORMAL_B + new_line)
+            self.logger.print(b''.join((color, line_stripped, ANSI_NORMAL_B, new_line)))
         else:
             # Partial line, print with color and without reset, which will be
             # handled by some future call
             self.logger.print(color + line)
             self._trailing_color = True
 
+    def _match_and_print_line(self, line, line_strip, line_matcher):
+        #  type: (bytes, bytes, LineMatcher) -> None
+        # the matcher works on raw bytes, so filtered-out lines don't
+        # pay for a decode; only displayed lines are decoded below
+        if self._force_line_print or line_matcher.matches_all or line_matcher.match(line):
+            try:
+                decoded_line = line.decode()
+                self.decode_error_cnt = 0
+            except UnicodeDecodeError:
+                decoded_line = line_strip.decode(errors='ignore')
+                self.decode_error_cnt += 1
+                if self.decode_error_cnt >= 3:
+                    warning_print('Failed to decode multiple lines in a row. Try checking the baud rate and XTAL frequency setting in menuconfig')
+                    self.decode_error_cnt = 0
+            self.print_colored(line)
+            self.compare_elf_sha256(decoded_line)
+            self.logger.handle_possible_pc_address_in_line(line_strip)
+
     def handle_serial_input(self, data, console_parser, coredump, gdb_helper, line_matcher,
                             check_gdb_stub_and_run, finalize_line=False):
         #  type: (bytes, ConsoleParser, CoreDump, Optional[GDBHelper], LineMatcher, Callable, bool) -> None
@@ -148,26 +197,20 @@ class SerialHandler:
                 data = data[(pos + 1):]
 
         sp = self.splitdata(data)
+        # entering the coredump context manager costs two Python calls per
+        # line; skip it altogether when core dump decoding is disabled
+        coredump_active = coredump is not None and coredump.enabled
         for line in sp:
             line_strip = line.strip()
-            if self._serial_check_exit and line_strip == EXIT_KEY.encode('latin-1'):
+            if self._serial_check_exit and line_strip == EXIT_KEY_B:
                 raise SerialStopException()
             if self.target != 'linux':
                 self.check_panic_decode_trigger(line_strip)
-            with coredump.check(line_strip):
-                try:
-                    decoded_line = line.decode()
-                    self.decode_error_cnt = 0
-                except UnicodeDecodeError:
-                    decoded_line = line_strip.decode(errors='ignore')
-                    self.decode_error_cnt += 1
-                    if self.decode_error_cnt >= 3:
-                        warning_print('Failed to decode multiple lines in a row. Try checking the baud rate and XTAL frequency setting in menuconfig')
-                        self.decode_error_cnt = 0
-                if self._force_line_print or line_matcher.match(decoded_line):
-                    self.print_colored(line)
-                    self.compare_elf_sha256(decoded_line)
-                    self.logger.handle_possible_pc_address_in_line(line_strip)
+            if coredump_active:
+                with coredump.check(line_strip):
+                    self._match_and_print_line(line, line_strip, line_matcher)
+            else:
+                self._match_and_print_line(line, line_strip, line_matcher)
             check_gdb_stub_and_run(line_strip)
             self._force_line_print = False
 
@@ -181,7 +224,7 @@ class SerialHandler:
         # to make a decision.
         force_print_or_matched = any((
             self._force_line_print,
-            (finalize_line and line_matcher.match(self._last_line_part.decode(errors='ignore')))
+            (finalize_line and (line_matcher.matches_all or line_matcher.match(self._last_line_part)))
         ))
         if self._last_line_part != b'' and force_print_or_matched:
             self._force_line_print = True
@@ -193,11 +236,12 @@ class SerialHandler:
             # handle_possible_pc_address_in_line is invoked to avoid this problem.
             # ADDRESS_RE matches 10 character long addresses. Therefore, we
             # keep the last 9 characters.
-            self.logger.pc_address_buffer = self._last_line_part[-9:]
+            tail = self._last_line_part[-9:]
+            self.logger.pc_address_buffer = tail
             # GDB sequence can be cut in half also. GDB sequence is 7
             # characters long, therefore, we save the last 6 characters.
             if gdb_helper:
-                gdb_helper.gdb_buffer = self._last_line_part[-6:]
+                gdb_helper.gdb_buffer = tail[-6:]
             self._last_line_part = b''
         # else: keeping _last_line_part and it will be processed the next time
         # handle_serial_input is invoked
@@ -206,7 +250,10 @@ class SerialHandler:
         if self._decode_panic == PANIC_DECODE_DISABLE:
             return
 
-        if self._reading_panic == PANIC_IDLE and re.search(PANIC_START, line.decode('ascii', errors='ignore')):
+        # check for the fixed 'Core ' part of the marker first; it rules out
+        # the regex (and the decode it needs) for almost all lines
+        if (self._reading_panic == PANIC_IDLE and PANIC_START_PREFIX in line
+                and PANIC_START_REGEX.search(line)):
             self._reading_panic = PANIC_READING
             note_print('Stack dump detected')
 
@@ -215,13 +262,14 @@ class SerialHandler:
             self.logger.output_enabled = False
 
         if self._reading_panic in [PANIC_READING, PANIC_READING_STACK]:
-            self._panic_buffer += line.replace(b'\r', b'') + b'\n'
+            self._panic_buffer += line.translate(None, b'\r')
+            self._panic_buffer += b'\n'
 
         if self._reading_panic == PANIC_READING_STACK and not line:
             self._reading_panic = PANIC_IDLE
             self.logger.output_enabled = True
             try:
-                out = self.panic_handler.process_panic_output(self._panic_buffer)
+                out = self.panic_handler.process_panic_output(bytes(self._panic_buffer))
                 if out:
                     note_print('Backtrace:\n\n', prefix='\n')
                     self.logger.print(out)
@@ -231,35 +279,57 @@ class SerialHandler:
                 # we stopped logging with PANIC_STACK_DUMP and re-enabled logging with PANIC_END
                 l_idx = self._panic_buffer.find(PANIC_STACK_DUMP)
                 r_idx = self._panic_buffer.find(PANIC_END)
-                self.logger.print(self._panic_buffer[l_idx:r_idx])
+                self.logger.print(bytes(self._panic_buffer[l_idx:r_idx]))
 
-            self._panic_buffer = b''
+            self._panic_buffer.clear()
+            # deliver everything emitted during the panic burst in one go
+            flush_stderr()
 
     def get_flashed_sha256(self, line: str) -> Optional[str]:
-        elf_sha256_matcher = re.compile(
-            r'ELF file SHA256:\s+(?P<sha256_flashed>[a-z0-9]+)'
-        )
-        file_sha256_flashed_match = re.search(elf_sha256_matcher, line)
+        file_sha256_flashed_match = ELF_SHA256_REGEX.search(line)
         if not file_sha256_flashed_match:
             return None
         return file_sha256_flashed_match.group('sha256_flashed')
 
+    def _get_elf_sha256(self, elf_file):  # type: (str) -> str
+        stat = os.stat(elf_file)
+        key = (stat.st_mtime_ns, stat.st_size)
+        cached = self._sha256_cache.get(elf_file)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        digest = get_sha256(elf_file)
+        self._sha256_cache[elf_file] = (key, digest)
+        return digest
+
     def compare_elf_sha256(self, line):  # type: (str) -> None
         file_sha256_flashed = self.get_flashed_sha256(line)
         if not file_sha256_flashed:
             return
-        if not all([os.path.exists(file) for file in self.elf_files]):
-            warning_print('ELF file not found. '
-                          "You need to build & flash the project before running 'monitor', "
-                          'and the binary on the device must match the one in the build directory exactly. ')
-        else:
-            for elf_file in self.elf_files:
-                file_sha256_build = get_sha256(elf_file)
-                if file_sha256_flashed in f'{file_sha256_build}':
-                    break
-            else:
-                warning_print(f'Checksum mismatch between flashed and built applications. '
-                              f'Checksum of built application is {file_sha256_build}')
+        if self._elf_files_exist is None:
+            # only a positive result is cached: the files can be rebuilt
+            # externally at any moment, so a failed check is repeated on the
+            # next SHA256 line instead of latching the warning
+            if all(os.path.exists(file) for file in self.elf_files):
+                self._elf_files_exist = True
+        if self._elf_files_exist:
+            try:
+                for elf_file in self.elf_files:
+                    file_sha256_build = self._get_elf_sha256(elf_file)
+                    # the flashed digest may be just a prefix of the full one
+                    if file_sha256_flashed in file_sha256_build:
+                        break
+                else:
+                    warning_print(f'Checksum mismatch between flashed and built applications. '
+                                  f'Checksum of built application is {file_sha256_build}')
+                return
+            except OSError:
+                # an ELF file disappeared after the cached existence check
+                # (e.g. the build directory was removed while monitoring);
+                # re-check on the next SHA256 line
+                self._elf_files_exist = None
+        warning_print('ELF file not found. '
+                      "You need to build & flash the project before running 'monitor', "
+                      'and the binary on the device must match the one in the build directory exactly. ')
 
     def handle_commands(self, cmd, chip, run_make_func, console_reader, serial_reader):
         # type: (int, str, Callable, ConsoleReader, Reader) -> None
@@ -279,8 +349,12 @@ class SerialHandler:
             self.reset.hard()
             self.logger.output_enabled = True
         elif cmd == CMD_MAKE:
+            self._sha256_cache.clear()  # the build is about to replace the ELF files
+            self._elf_files_exist = None
             run_make_func('encrypted-flash' if self.encrypted else 'flash')
         elif cmd == CMD_APP_FLASH:
+            self._sha256_cache.clear()
+            self._elf_files_exist = None
             run_make_func('encrypted-app-flash' if self.encrypted else 'app-flash')
         elif cmd == CMD_OUTPUT_TOGGLE:
             self.logger.output_toggle()
@@ -310,10 +384,10 @@ class SerialHandlerNoElf(SerialHandler):
 
         sp = self.splitdata(data)
         for line in sp:
-            if self._serial_check_exit and line.strip() == EXIT_KEY.encode('latin-1'):
+            if self._serial_check_exit and line.strip() == EXIT_KEY_B:
                 raise SerialStopException()
 
-            if self._force_line_print or line_matcher.match(line.decode(errors='ignore')):
+            if self._force_line_print or line_matcher.matches_all or line_matcher.match(line):
                 self.print_colored(line)
                 self._force_line_print = False
 
@@ -323,7 +397,7 @@ class SerialHandlerNoElf(SerialHandler):
 
         force_print_or_matched = any((
             self._force_line_print,
-            (finalize_line and line_matcher.match(self._last_line_part.decode(errors='ignore')))
+            (finalize_line and (line_matcher.matches_all or line_matcher.match(self._last_line_part)))
         ))
 
         if self._last_line_part != b'' and force_print_or_matched:
@@ -1,7 +1,10 @@
 # SPDX-FileCopyrightText: 2015-2024 Espressif Systems (Shanghai) CO LTD
 # SPDX-License-Identifier: Apache-2.0
 
+import os
 import queue  # noqa: F401
+import select
+import struct
 import subprocess  # noqa: F401
 import sys
 import time
@@ -9,6 +12,19 @@ import time
 import serial
 from serial.tools import list_ports
 
+if sys.platform == 'linux':
+    import fcntl
+    import termios
+
+    # `serial_struct` format based on linux kernel source:
+    # https://github.com/torvalds/linux/blob/25aa0bebba72b318e71fe205bfd1236550cc9534/include/uapi/linux/serial.h#L19
+    # compiled once; the format would otherwise be re-parsed on every close
+    SERIAL_STRUCT = struct.Struct('iiIiiiiiHcciHHPHIL')
+    # `closing_wait` is the 13th (indexing from 0) field; its offset is the
+    # size of everything before it, native alignment padding included
+    CLOSING_WAIT_STRUCT = struct.Struct('H')
+    CLOSING_WAIT_OFFSET = struct.calcsize('iiIiiiiiHcci')
+
 from .constants import (ASYNC_CLOSING_WAIT_NONE, CHECK_ALIVE_FLAG_TIMEOUT,
                         FILTERED_PORTS, HIGH, LOW, RECONNECT_DELAY, TAG_SERIAL)
 from .output_helpers import error_print, note_print, yellow_print
@@ -35,7 +51,8 @@ class SerialReader(Reader):
         self.reset = reset
         self.open_port_attempts = open_port_attempts
         self.reset_strategy = Reset(serial_instance, target)
-        if not hasattr(self.serial, 'cancel_read'):
+        self._cancel_read = getattr(self.serial, 'cancel_read', None)
+        if self._cancel_read is None:
             # enable timeout for checking alive flag,
             # if cancel_read not available
             self.serial.timeout = CHECK_ALIVE_FLAG_TIMEOUT
@@ -57,11 +74,9 @@ class SerialReader(Reader):
                     # If the connection to the port fails and --open-port-attempts was not specified,
                     # recommend other available ports and exit.
                     port_list = '\n'.join(
-                        [
-                            p.device
-                            for p in list_ports.comports()
-                            if not p.device.endswith(FILTERED_PORTS)
-                        ]
+                        p.device
+                        for p in list_ports.comports()
+                        if not p.device.endswith(FILTERED_PORTS)
                     )
                     note_print(f'Connection to {self.serial.portstr} failed. Available ports:\n{port_list}')
                     return
@@ -70,8 +85,28 @@ class SerialReader(Reader):
             while self.alive:
                 try:
                     if self.serial.is_open:
-                        # in_waiting assumes the port is already open
-                        data = self.serial.read(self.serial.in_waiting or 1)
+                        # fetched fresh every iteration as reconnects replace it
+                        fd = getattr(self.serial, 'fd', None)
+                        if fd is not None:
+                            # POSIX: read the descriptor directly, skipping
+                            # pyserial's timeout bookkeeping on the hot path;
+                            # one select and at most one read per chunk
+                            ready, _, _ = select.select([fd], [], [], CHECK_ALIVE_FLAG_TIMEOUT)
+                            data = os.read(fd, 4096) if ready else b''
+                            if ready and not data:
+                                # EOF from the descriptor means the device is gone
+                                raise serial.SerialException('device reports readiness to read but returned no data')
+                        else:
+                            # backends without an fd (Windows, socket://, ...):
+                            # block until the first byte arrives (or the timeout
+                            # / cancel_read fires), then drain whatever else is
+                            # already buffered so a burst is delivered as one chunk
+                            data = self.serial.read(1)
+                            if data:
+                                # in_waiting assumes the port is already open
+                                waiting = self.serial.in_waiting
+                                if waiting:
+                                    data += self.serial.read(waiting)
                     else:
                         raise serial.PortNotOpenError
                 except (serial.SerialException, IOError, OSError) as e:
@@ -104,6 +139,9 @@ class SerialReader(Reader):
         self.reset_strategy._setDTR(LOW)
 
         self.serial.open()
+        # the port was likely closed when Reset was constructed; retry the
+        # low-latency request now that there is an fd to apply it to
+        self.reset_strategy._try_enable_low_latency()
 
         # set DTR/RTS into expected HIGH state, but set the RTS first to avoid reset
         self.reset_strategy._setRTS(HIGH)
@@ -118,15 +156,8 @@ class SerialReader(Reader):
 
     def _disable_closing_wait_or_discard_data(self):  # type: () -> None
         # ignore setting closing wait for network ports such as RFC2217
-        if sys.platform == 'linux' and hasattr(self.serial, 'fd') and self.serial.is_open:
-            import fcntl
-            import struct
-            import termios
-
-            # `serial_struct` format based on linux kernel source:
-            # https://github.com/torvalds/linux/blob/25aa0bebba72b318e71fe205bfd1236550cc9534/include/uapi/linux/serial.h#L19
-            struct_format = 'iiIiiiiiHcciHHPHIL'
-            buf = bytes(struct.calcsize(struct_format))
+        if sys.platform == 'linux' and getattr(self.serial, 'fd', None) is not None and self.serial.is_open:
+            buf = bytes(SERIAL_STRUCT.size)
 
             # get serial_struct
             try:
@@ -134,19 +165,18 @@ class SerialReader(Reader):
             except IOError:
                 # port has been disconnected
                 return
-            serial_struct = list(struct.unpack(struct_format, buf))
-
             # set `closing_wait` - amount of time, in hundredths of a second, that the kernel should wait before closing port
-            # `closing_wait` is 13th (indexing from 0) variable in `serial_struct`, for reference see struct_format var
-            if serial_struct[12] == ASYNC_CLOSING_WAIT_NONE:
+            # it is the only field written, so it is read and patched in place
+            # instead of unpacking and repacking the whole serial_struct
+            if CLOSING_WAIT_STRUCT.unpack_from(buf, CLOSING_WAIT_OFFSET)[0] == ASYNC_CLOSING_WAIT_NONE:
                 return
 
-            serial_struct[12] = ASYNC_CLOSING_WAIT_NONE
+            buf = bytearray(buf)
+            CLOSING_WAIT_STRUCT.pack_into(buf, CLOSING_WAIT_OFFSET, ASYNC_CLOSING_WAIT_NONE)
 
             # set serial_struct
-            buf = struct.pack(struct_format, *serial_struct)
             try:
-                fcntl.ioctl(self.serial.fd, termios.TIOCSSERIAL, buf)
+                fcntl.ioctl(self.serial.fd, termios.TIOCSSERIAL, bytes(buf))
             except OSError:
                 # Discard written but not yet transmitted data
                 termios.tcflush(self.serial.fd, termios.TCOFLUSH)
@@ -155,9 +185,9 @@ class SerialReader(Reader):
 
     def _cancel(self):
         #  type: () -> None
-        if hasattr(self.serial, 'cancel_read'):
+        if self._cancel_read is not None:
             try:
-                self.serial.cancel_read()
+                self._cancel_read()
             except Exception:  # noqa
                 pass
 
@@ -176,9 +206,12 @@ class LinuxReader(Reader):
     def run(self):  # type: () -> None
         try:
             while self.alive:
-                c = self.proc.stdout.read(1)  # type: ignore
-                if c:
-                    self.event_queue.put((TAG_SERIAL, c), False)
+                # stdout is unbuffered, so this blocks until the process
+                # writes something and then returns the whole burst at once
+                # instead of queueing it byte by byte
+                data = self.proc.stdout.read(4096)  # type: ignore
+                if data:
+                    self.event_queue.put((TAG_SERIAL, data), False)
         finally:
             self.proc.terminate()
 
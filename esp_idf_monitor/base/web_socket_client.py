@@ -2,6 +2,7 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import json
+import random
 import time
 
 from .output_helpers import error_print, note_print
@@ -30,6 +31,7 @@ class WebSocketClient(object):
 
     RETRIES = 3
     CONNECTION_RETRY_DELAY = 1
+    MAX_RETRY_DELAY = 8
 
     def __init__(self, url):  # type: (str) -> None
         self.url = url
@@ -41,6 +43,7 @@ class WebSocketClient(object):
         """
 
         self.close()
+        delay = self.CONNECTION_RETRY_DELAY
         for _ in range(self.RETRIES):
             try:
                 self.ws = websocket.create_connection(self.url)
@@ -49,7 +52,10 @@ class WebSocketClient(object):
                 raise RuntimeError('Please install the websocket_client package for IDE integration!')
             except Exception as e:  # noqa
                 error_print('WebSocket connection error: {e}')
-            time.sleep(self.CONNECTION_RETRY_DELAY)
+            # truncated exponential backoff with jitter; retries quickly after
+            # a transient flap but waits longer while the server restarts
+            time.sleep(delay + random.uniform(0, delay / 2))
+            delay = min(delay * 2, self.MAX_RETRY_DELAY)
         else:
             raise RuntimeError('Cannot connect to WebSocket server')
 
@@ -20,7 +20,6 @@
 #
 
 import codecs
-import io
 import os
 import queue
 import re
@@ -356,11 +355,7 @@ def main() -> None:
     # use EOL from argument; defaults to LF for Linux targets and CR otherwise
     args.eol = args.eol or ('LF' if args.target == 'linux' else 'CR')
 
-    if isinstance(args.rom_elf_file, io.BufferedReader):
-        rom_elf_file = args.rom_elf_file.name
-        args.rom_elf_file.close()  # don't need this as a file
-    else:
-        rom_elf_file = args.rom_elf_file if args.rom_elf_file is not None else get_rom_elf_path(args.target, args.revision)
+    rom_elf_file = args.rom_elf_file if args.rom_elf_file is not None else get_rom_elf_path(args.target, args.revision)
 
     # remove the parallel jobserver arguments from MAKEFLAGS, as any
     # parent make is only running 1 job (monitor), so we can re-spawn
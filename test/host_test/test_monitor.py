@@ -450,9 +450,7 @@ class TestConfig(TestBaseClass):
         # check in pyserial log that custom reset sequence was used (Note: we cannot test the wait part)
         my_seq = [
             'INFO:pySerial.socket:ignored _update_rts_state(1)',  # R1
-            'INFO:pySerial.socket:ignored _update_dtr_state(False)',  # expected workaround for windows RTS setting
             'INFO:pySerial.socket:ignored _update_rts_state(0)',  # R0
-            'INFO:pySerial.socket:ignored _update_dtr_state(False)',  # expected workaround for windows RTS setting
             'INFO:pySerial.socket:ignored _update_dtr_state(1)',  # D1
         ]
         assert '\n'.join(my_seq) in log_seq
@@ -480,9 +478,7 @@ class TestConfig(TestBaseClass):
         # check in pyserial log that custom reset sequence was used (Note: we cannot test the wait part)
         my_seq = [
             'INFO:pySerial.socket:ignored _update_rts_state(1)',  # R1
-            'INFO:pySerial.socket:ignored _update_dtr_state(False)',  # expected workaround for windows RTS setting
             'INFO:pySerial.socket:ignored _update_rts_state(0)',  # R0
-            'INFO:pySerial.socket:ignored _update_dtr_state(False)',  # expected workaround for windows RTS setting
             'INFO:pySerial.socket:ignored _update_dtr_state(1)',  # D1
         ]
         assert '\n'.join(my_seq) in log_seq